@@ -1,10 +1,15 @@
 import logging
 import os
+import random
+import signal
 import sys
+import threading
 import time
+from dataclasses import dataclass, field
 from http import HTTPStatus
-from json.decoder import JSONDecodeError
+from types import MappingProxyType
 
+import orjson
 import requests
 import telegram
 from dotenv import load_dotenv
@@ -27,25 +32,54 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 600
+MAX_RETRY_TIME = 3600
+BACKOFF_BASE = 1.3
+ERROR_NOTIFY_TTL = 1800
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
+LAST_ETAG = None
+LAST_MODIFIED = None
+
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
-checked_status = None
+_VERDICT_TEMPLATES = MappingProxyType({
+    status: 'Изменился статус проверки работы "%s". ' + verdict
+    for status, verdict in HOMEWORK_STATUSES.items()
+})
+
+_SENTINEL = object()
+_NOT_DICT_MESSAGE = 'Ответ API имеет некорректный тип.'
+_NO_HOMEWORKS_KEY_MESSAGE = 'В ответе отсутствует ключ homeworks.'
+_BAD_HOMEWORKS_TYPE_MESSAGE = (
+    'Неверный тип данных у значения по ключу homeworks.'
+)
+_EMPTY_RESPONSE_MESSAGE = 'Пустой ответ. Нет ни одной домашки.'
+
+
+@dataclass
+class BotState:
+    """Изменяемое состояние одного цикла опроса бота."""
+
+    checked_status: dict = field(default_factory=dict)
+    last_error_key: tuple = None
+    last_error_at: float = 0.0
 
 
 def send_message(bot, message):
     """Отправка сообщений в Telegram чат."""
     try:
         bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
-        logger.info(f"Удачная отправка сообщения в Telegram: {message}")
+        logger.info("Удачная отправка сообщения в Telegram: %s", message)
     except telegram.TelegramError as error:
-        logger.error(f"Cбой при отправке сообщения в Telegram: {error}")
+        logger.error("Cбой при отправке сообщения в Telegram: %s", error)
         raise telegram.TelegramError(
             f"Cбой при отправке сообщения в Telegram: {message}"
         )
@@ -53,23 +87,40 @@ def send_message(bot, message):
 
 def get_api_answer(current_timestamp):
     """Выполнение запроса к API сервиса Практикум.Домашка."""
+    global LAST_ETAG, LAST_MODIFIED
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
+    headers = {}
+    if LAST_ETAG:
+        headers['If-None-Match'] = LAST_ETAG
+    if LAST_MODIFIED:
+        headers['If-Modified-Since'] = LAST_MODIFIED
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        response = SESSION.get(
+            ENDPOINT, headers=headers, params=params, timeout=(5, 30)
+        )
         response_status = response.status_code
+        if response_status == HTTPStatus.NOT_MODIFIED:
+            logger.debug('Ответ API не изменился с прошлого запроса')
+            return {'homeworks': [], 'current_date': timestamp}
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
 
         try:
-            response = response.json()
-        except JSONDecodeError:
+            response = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             logger.error("Ответ не преобразован в JSON")
-            raise JSONDecodeError("Ответ не преобразован в JSON")
+            raise CustomResponseExceptionError(
+                "Ответ не преобразован в JSON"
+            )
 
-        if int(response_status) != HTTPStatus.OK:
+        if response_status != HTTPStatus.OK:
             error = response['error']['error']
             errortext = f'API сервиса Практикум.Домашка вернул ошибку: {error}'
             logger.error(errortext)
             raise CustomResponseExceptionError(errortext)
+        LAST_ETAG = etag
+        LAST_MODIFIED = last_modified
         return response
     except RequestException as error:
         errortext = f'API сервиса Практикум.Домашка вернул ошибку: {error}'
@@ -79,19 +130,20 @@ def get_api_answer(current_timestamp):
 
 def check_response(response):
     """Проверка ответа API на корректность."""
-    try:
-        homeworks = response['homeworks']
-        if not isinstance(homeworks, list):
-            logger.error('Неверный тип данных у значения по ключу homeworks.')
-            raise TypeError(
-                'Неверный тип данных у значения по ключу homeworks.')
-        if not homeworks:
-            logger.error('Пустой ответ. Нет ни одной домашки.')
-            raise TypeError('Пустой ответ. Нет ни одной домашки.')
-        return homeworks
-    except KeyError:
-        logger.error('В ответе отсутствует ключ homeworks.')
-        raise KeyError('В ответе отсутствует ключ homeworks.')
+    if type(response) is not dict:
+        logger.error(_NOT_DICT_MESSAGE)
+        raise TypeError(_NOT_DICT_MESSAGE)
+    homeworks = response.get('homeworks', _SENTINEL)
+    if homeworks is _SENTINEL:
+        logger.error(_NO_HOMEWORKS_KEY_MESSAGE)
+        raise KeyError(_NO_HOMEWORKS_KEY_MESSAGE)
+    if type(homeworks) is not list:
+        logger.error(_BAD_HOMEWORKS_TYPE_MESSAGE)
+        raise TypeError(_BAD_HOMEWORKS_TYPE_MESSAGE)
+    if not homeworks:
+        logger.error(_EMPTY_RESPONSE_MESSAGE)
+        raise TypeError(_EMPTY_RESPONSE_MESSAGE)
+    return homeworks
 
 
 def parse_status(homework):
@@ -100,13 +152,29 @@ def parse_status(homework):
         raise KeyError("Отсутствует ключ homework_name в ответе API.")
     if 'status' not in homework:
         raise KeyError("Отсутствует ключ status в ответе API.")
-    homework_name = homework.get('homework_name')
-    homework_status = homework.get('status')
-    if homework_status not in HOMEWORK_STATUSES:
+    try:
+        template = _VERDICT_TEMPLATES[homework['status']]
+    except KeyError:
         logger.error('Недокументированный статус домашней работы.')
         raise KeyError('Недокументированный статус домашней работы.')
-    verdict = HOMEWORK_STATUSES[homework_status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return template % homework['homework_name']
+
+
+def _notify_failure(bot, state, error):
+    """Уведомление о сбое с повтором не чаще ERROR_NOTIFY_TTL."""
+    error_key = (type(error).__name__, str(error)[:200])
+    now = time.monotonic()
+    if (error_key == state.last_error_key
+            and now - state.last_error_at <= ERROR_NOTIFY_TTL):
+        return
+    try:
+        send_message(bot, f'Сбой в работе программы: {error}')
+    except telegram.TelegramError as send_error:
+        logger.error('Не удалось отправить уведомление о сбое: %s',
+                     send_error)
+        return
+    state.last_error_key = error_key
+    state.last_error_at = now
 
 
 def check_tokens():
@@ -121,27 +189,48 @@ def main():
         raise SystemExit('Программа принудительно остановлена.')
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     current_timestamp = int(time.time())
-    last_error_msg = ''
-    while True:
+    state = BotState()
+    delay = RETRY_TIME
+    fail_count = 0
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    while not stop.is_set():
+        cycle_start = time.monotonic()
         try:
             response = get_api_answer(current_timestamp)
-            homeworks = check_response(response)
-            homework = homeworks[0]
-            if homework:
-                status = parse_status(homework)
-                send_message(bot, status)
+            # Пустой список homeworks (в том числе ответ 304) - штатный
+            # «тихий» цикл, а не ошибка формата ответа.
+            homeworks = response.get('homeworks')
+            if homeworks != []:
+                homeworks = check_response(response)
+            statuses = []
+            new_statuses = {}
+            for homework in homeworks:
+                name = homework.get('homework_name')
+                status = homework.get('status', _SENTINEL)
+                seen_status = state.checked_status.get(name, _SENTINEL)
+                if status is _SENTINEL or status != seen_status:
+                    statuses.append(parse_status(homework))
+                    new_statuses[name] = status
+            if statuses:
+                send_message(bot, '\n\n'.join(statuses))
+                state.checked_status.update(new_statuses)
             else:
                 logger.debug('В ответе от API отсутствует новый статус')
 
             current_timestamp = response['current_date']
-            time.sleep(RETRY_TIME)
+            delay = RETRY_TIME
+            fail_count = 0
         except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            print(last_error_msg)
-            if last_error_msg != message:
-                last_error_msg = message
-                send_message(bot, message)
-            time.sleep(RETRY_TIME)
+            if delay < MAX_RETRY_TIME:
+                fail_count += 1
+                delay = min(
+                    MAX_RETRY_TIME, RETRY_TIME * BACKOFF_BASE**fail_count
+                )
+            _notify_failure(bot, state, error)
+        next_fire = cycle_start + delay + random.uniform(-0.1, 0.1) * delay
+        stop.wait(max(0.0, next_fire - time.monotonic()))
+    logger.debug('Получен сигнал остановки, завершение работы')
 
 
 if __name__ == '__main__':
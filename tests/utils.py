@@ -1,6 +1,18 @@
 from inspect import signature
 from types import ModuleType
 
+import requests
+
+
+def patch_session_get(monkeypatch, mock_get):
+    """Patches requests.Session.get so mocks see session-level headers."""
+    def session_get(self, url, params=None, **kwargs):
+        headers = dict(self.headers)
+        headers.update(kwargs.pop('headers', None) or {})
+        return mock_get(url, params=params, headers=headers, **kwargs)
+
+    monkeypatch.setattr(requests.Session, 'get', session_get)
+
 
 def check_function(scope: ModuleType, func_name: str, params_qty: int = 0):
     """Checks if scope has a function with specific name and params with qty"""